@@ -1,14 +1,34 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, request, jsonify, render_template, Response, stream_with_context
 from werkzeug.exceptions import HTTPException
 from flask_cors import CORS
 import json
-from database import setup_sample_data, execute_query, ping_db, import_csv_folder
+import itertools
+import uuid
+from collections import OrderedDict
+from bson import ObjectId
+from pymongo.errors import PyMongoError
+from database import setup_sample_data, execute_query, ping_db, import_csv_folder, open_query_cursor
 import os
 from llm_service import natural_language_to_query, test_groq_auth
+from export_data import (
+    EXPORT_FORMATS, COMPRESSIONS, compression_available, projection_columns, overlapping_fields,
+    stream_export, export_filename, export_mimetype
+)
 
 app = Flask(__name__, static_folder='../frontend', static_url_path='')
 CORS(app)  # Enable CORS for all routes
 
+# Recently translated queries, so /api/query/export can reuse them by id
+MAX_CACHED_QUERIES = 256
+query_cache = OrderedDict()
+
+def remember_query(mongo_query):
+    query_id = uuid.uuid4().hex
+    query_cache[query_id] = mongo_query
+    if len(query_cache) > MAX_CACHED_QUERIES:
+        query_cache.popitem(last=False)
+    return query_id
+
 @app.route('/')
 def index():
     return app.send_static_file('index.html')
@@ -95,6 +115,8 @@ def process_query():
             "details": mongo_query.get("details")
         }), http_status
     
+    query_id = remember_query(mongo_query)
+
     # Execute the query
     result = execute_query(mongo_query)
     
@@ -103,6 +125,7 @@ def process_query():
         return jsonify({
             "error": f"Database error: {result['error']}",
             "query": mongo_query,
+            "query_id": query_id,
             "question": user_question
         }), 500
     
@@ -117,10 +140,106 @@ def process_query():
     # Return the successful response
     return jsonify({
         "query": mongo_query,
+        "query_id": query_id,
         "result": result,
         "question": user_question
     })
 
+@app.route('/api/query/export', methods=['POST'])
+def export_query():
+    """Stream the full result set of a translated query as a CSV or JSONL download"""
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+    for key in ("query_id", "format", "compression"):
+        if data.get(key) is not None and not isinstance(data[key], str):
+            return jsonify({"error": f"{key} must be a string"}), 400
+
+    if data.get("query_id"):
+        mongo_query = query_cache.get(data["query_id"])
+        if mongo_query is None:
+            return jsonify({"error": "Unknown or expired query_id"}), 404
+    elif isinstance(data.get("query"), dict):
+        mongo_query = data["query"]
+    else:
+        return jsonify({"error": "Provide a query_id or a query object"}), 400
+
+    fmt = data.get("format", "csv")
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": f"Unsupported format: {fmt}"}), 400
+
+    compression = data.get("compression") or None
+    if compression is not None and compression not in COMPRESSIONS:
+        return jsonify({"error": f"Unsupported compression: {compression}"}), 400
+    if not compression_available(compression):
+        return jsonify({"error": "zstd compression requires the zstandard package"}), 400
+
+    fields = data.get("fields")
+    if fields is not None and (not isinstance(fields, list) or not all(isinstance(f, str) for f in fields)):
+        return jsonify({"error": "fields must be a list of field names"}), 400
+    overlap = overlapping_fields(fields) if fields else None
+    if overlap:
+        return jsonify({"error": f"fields must not overlap: {overlap[0]} contains {overlap[1]}"}), 400
+    for key in ("filter", "projection"):
+        if mongo_query.get(key) is not None and not isinstance(mongo_query[key], dict):
+            return jsonify({"error": f"Query {key} must be an object"}), 400
+    columns = fields or projection_columns(mongo_query.get("projection"))
+    columns_source = "fields" if fields else "projection" if columns else None
+
+    status = ping_db()
+    if not status.get("ok"):
+        return jsonify({
+            "error": "MongoDB is not reachable. Start MongoDB and try again.",
+            "details": status.get("error")
+        }), 503
+
+    cursor = open_query_cursor(mongo_query, fields)
+    if isinstance(cursor, dict) and "error" in cursor:
+        if cursor.get("http_status") == 400:
+            return jsonify({"error": cursor["error"], "query": mongo_query}), 400
+        return jsonify({
+            "error": f"Database error: {cursor['error']}",
+            "query": mongo_query
+        }), 500
+
+    # Read the first document up front so query errors still get a JSON response
+    # and CSV has a header when no columns were selected
+    try:
+        first = next(cursor, None)
+    except PyMongoError as e:
+        cursor.close()
+        return jsonify({
+            "error": f"Database error: {str(e)}",
+            "query": mongo_query
+        }), 500
+
+    if fmt == "csv" and not columns:
+        columns_source = "first-row"
+        # Document ObjectIds are left out so re-importing assigns fresh ones, but an
+        # aggregate's _id is its group key and is kept, as /api/query shows it
+        columns = [
+            k for k in first
+            if not (k == "_id" and mongo_query.get("operation") == "find" and isinstance(first[k], ObjectId))
+        ] if first else []
+    docs = cursor if first is None else itertools.chain([first], cursor)
+
+    def generate():
+        try:
+            yield from stream_export(docs, fmt, columns, compression)
+        finally:
+            cursor.close()
+
+    filename = export_filename(mongo_query["collection"], fmt, compression)
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if columns_source:
+        # "first-row" warns that fields appearing only in later rows are not exported
+        headers["X-Export-Columns-Source"] = columns_source
+    return Response(
+        stream_with_context(generate()),
+        mimetype=export_mimetype(fmt, compression),
+        headers=headers
+    )
+
 # Global error handlers to ensure JSON on errors instead of HTML
 @app.errorhandler(HTTPException)
 def handle_http_exception(e: HTTPException):
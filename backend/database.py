@@ -116,6 +116,43 @@ def execute_query(query):
     except Exception as e:
         return {"error": str(e)}
 
+def open_query_cursor(query, fields=None):
+    """Open a cursor for a translated query without materialising its results.
+    Only read-only find and aggregate queries can be opened; anything else returns
+    an error dict, with http_status 400 when the query itself is invalid.
+    """
+    collection = query.get("collection")
+    operation = query.get("operation")
+    if not isinstance(collection, str) or not collection:
+        return {"error": "Query collection must be a non-empty string", "http_status": 400}
+
+    if operation == "aggregate":
+        pipeline = query.get("pipeline", [])
+        if not isinstance(pipeline, list) or not all(isinstance(stage, dict) for stage in pipeline):
+            return {"error": "Query pipeline must be a list of stages", "http_status": 400}
+        # Exports are read-only; these stages would write to the database
+        if any(key in ("$out", "$merge") for stage in pipeline for key in stage):
+            return {"error": "$out and $merge stages cannot be exported", "http_status": 400}
+
+    try:
+        if operation == "find":
+            filter_criteria = query.get("filter", {})
+            projection = query.get("projection", None)
+            # Let MongoDB drop unselected columns instead of shipping them over the wire
+            if not projection and fields:
+                projection = {field: 1 for field in fields}
+            return db[collection].find(filter_criteria, projection or None, batch_size=1000)
+
+        elif operation == "aggregate":
+            pipeline = query.get("pipeline", [])
+            return db[collection].aggregate(pipeline, allowDiskUse=True, batchSize=1000)
+
+        else:
+            return {"error": f"Operation {operation} cannot be exported", "http_status": 400}
+
+    except Exception as e:
+        return {"error": str(e)}
+
 def _infer_value_type(value: str):
     if value is None:
         return None
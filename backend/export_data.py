@@ -0,0 +1,173 @@
+import csv
+import io
+import json
+import re
+import zlib
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # zstd export is optional
+    zstandard = None
+
+
+EXPORT_FORMATS = {
+    "csv": {"extension": "csv", "mimetype": "text/csv"},
+    "jsonl": {"extension": "jsonl", "mimetype": "application/x-ndjson"},
+}
+
+COMPRESSIONS = {
+    "gzip": {"extension": "gz", "mimetype": "application/gzip"},
+    "zstd": {"extension": "zst", "mimetype": "application/zstd"},
+}
+
+# Rows are buffered into chunks of roughly this size before being compressed and sent
+CHUNK_SIZE = 64 * 1024
+
+
+def compression_available(compression: Optional[str]) -> bool:
+    if compression is None or compression == "gzip":
+        return True
+    if compression == "zstd":
+        return zstandard is not None
+    return False
+
+
+def projection_columns(projection: Optional[Dict[str, Any]]) -> Optional[List[str]]:
+    """Return the included fields of an inclusion projection, or None if it excludes fields."""
+    if not projection:
+        return None
+    included = [k for k, v in projection.items() if k != "_id" and v not in (0, False)]
+    if not included:
+        return None
+    if projection.get("_id") not in (None, 0, False):
+        included.insert(0, "_id")
+    return included
+
+
+def overlapping_fields(fields: List[str]) -> Optional[List[str]]:
+    """Return the first pair of fields where one is a dotted path inside the other."""
+    for field in fields:
+        for other in fields:
+            if other.startswith(field + "."):
+                return [field, other]
+    return None
+
+
+def get_field(doc: Dict[str, Any], field: str):
+    """Look up a possibly dotted field path in a document."""
+    value: Any = doc
+    for part in field.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def _json_default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    # ObjectId, Decimal128 and other BSON types
+    return str(value)
+
+
+def format_csv_value(value: Any) -> str:
+    """Render a value as a CSV cell that import_csv.py can load.
+    Numbers, booleans, None and plain text read back as the same values; strings that
+    look like numbers or nulls, nested documents and dates come back as inferred
+    scalars or text.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float, str)):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default)
+    return str(value)
+
+
+def _csv_lines(docs: Iterable[Dict[str, Any]], columns: List[str]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush_line(row):
+        writer.writerow(row)
+        line = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return line
+
+    yield flush_line(columns)
+    for doc in docs:
+        yield flush_line([format_csv_value(get_field(doc, c)) for c in columns])
+
+
+def _jsonl_lines(docs: Iterable[Dict[str, Any]], columns: Optional[List[str]]) -> Iterator[str]:
+    for doc in docs:
+        if columns:
+            doc = {c: get_field(doc, c) for c in columns}
+        yield json.dumps(doc, default=_json_default) + "\n"
+
+
+def _chunked(lines: Iterable[str], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    parts: List[str] = []
+    size = 0
+    for line in lines:
+        parts.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            yield "".join(parts).encode("utf-8")
+            parts = []
+            size = 0
+    if parts:
+        yield "".join(parts).encode("utf-8")
+
+
+def _compressed(chunks: Iterable[bytes], compression: Optional[str]) -> Iterator[bytes]:
+    if compression is None:
+        yield from chunks
+        return
+
+    if compression == "gzip":
+        # wbits=31 writes a gzip header and trailer around the deflate stream
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    else:
+        compressor = zstandard.ZstdCompressor().compressobj()
+
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def stream_export(docs: Iterable[Dict[str, Any]], fmt: str, columns: Optional[List[str]] = None,
+                  compression: Optional[str] = None) -> Iterator[bytes]:
+    """Yield the encoded (and optionally compressed) export of docs one chunk at a time.
+    CSV output requires columns since the header is written before any rows are read.
+    """
+    if fmt == "csv":
+        lines = _csv_lines(docs, columns or [])
+    else:
+        lines = _jsonl_lines(docs, columns)
+    return _compressed(_chunked(lines), compression)
+
+
+def export_filename(collection: str, fmt: str, compression: Optional[str]) -> str:
+    # Keep the name safe to place in a quoted Content-Disposition header
+    base = re.sub(r"[^A-Za-z0-9_.-]+", "_", collection).strip("._") or "export"
+    name = f"{base}.{EXPORT_FORMATS[fmt]['extension']}"
+    if compression:
+        name += f".{COMPRESSIONS[compression]['extension']}"
+    return name
+
+
+def export_mimetype(fmt: str, compression: Optional[str]) -> str:
+    if compression:
+        return COMPRESSIONS[compression]["mimetype"]
+    return EXPORT_FORMATS[fmt]["mimetype"]
@@ -0,0 +1,80 @@
+import pytest
+
+import app as app_module
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = iter(docs)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.docs)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    docs = []
+    monkeypatch.setattr(app_module, "ping_db", lambda: {"ok": True})
+    monkeypatch.setattr(app_module, "open_query_cursor", lambda query, fields=None: FakeCursor(docs))
+    return docs
+
+
+FIND_QUERY = {"collection": "products", "operation": "find"}
+
+
+@pytest.mark.parametrize("body", [
+    ["x"],
+    {"query_id": ["x"]},
+    {"query": FIND_QUERY, "format": ["csv"]},
+    {"query": FIND_QUERY, "compression": {"a": 1}},
+    {"query": FIND_QUERY, "format": "xlsx"},
+    {"query": FIND_QUERY, "compression": "brotli"},
+    {"query": {"collection": "products", "operation": "find", "projection": ["name"]}},
+    {"query": {"collection": "products", "operation": "find", "filter": "x"}},
+    {"query": FIND_QUERY, "fields": "name"},
+    {"query": FIND_QUERY, "fields": ["a", "a.b"]},
+    {},
+])
+def test_export_rejects_invalid_requests(client, body):
+    response = client.post("/api/query/export", json=body)
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+def test_export_unknown_query_id(client):
+    response = client.post("/api/query/export", json={"query_id": "missing"})
+    assert response.status_code == 404
+
+
+def test_export_csv_reports_first_row_columns(client, fake_db):
+    fake_db.extend([{"a": 1}, {"a": 2, "z": 3}])
+    response = client.post("/api/query/export", json={"query": FIND_QUERY})
+    assert response.status_code == 200
+    assert response.headers["X-Export-Columns-Source"] == "first-row"
+    assert response.headers["Content-Disposition"] == 'attachment; filename="products.csv"'
+    assert response.get_data() == b"a\r\n1\r\n2\r\n"
+
+
+def test_export_csv_keeps_aggregate_group_key(client, fake_db):
+    fake_db.extend([{"_id": "Electronics", "maxPrice": 1200}])
+    query = {"collection": "products", "operation": "aggregate", "pipeline": []}
+    response = client.post("/api/query/export", json={"query": query, "fields": None})
+    assert response.get_data() == b"_id,maxPrice\r\nElectronics,1200\r\n"
+
+
+def test_export_csv_uses_selected_fields(client, fake_db):
+    fake_db.extend([{"a": 1}, {"a": 2, "z": 3}])
+    response = client.post("/api/query/export", json={"query": FIND_QUERY, "fields": ["a", "z"]})
+    assert response.headers["X-Export-Columns-Source"] == "fields"
+    assert response.get_data() == b"a,z\r\n1,\r\n2,3\r\n"
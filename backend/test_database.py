@@ -0,0 +1,15 @@
+import pytest
+
+from database import open_query_cursor
+
+
+@pytest.mark.parametrize("query", [
+    {"collection": ["products"], "operation": "find"},
+    {"collection": "products", "operation": "count"},
+    {"collection": "products", "operation": "aggregate", "pipeline": {"$match": {}}},
+    {"collection": "products", "operation": "aggregate", "pipeline": [{"$match": {}}, {"$out": "products"}]},
+    {"collection": "products", "operation": "aggregate", "pipeline": [{"$merge": {"into": "customers"}}]},
+])
+def test_open_query_cursor_rejects_invalid_or_writing_queries(query):
+    result = open_query_cursor(query)
+    assert result["http_status"] == 400
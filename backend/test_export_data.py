@@ -0,0 +1,126 @@
+import csv
+import gzip
+import io
+import itertools
+import json
+from datetime import datetime
+
+import pytest
+
+from export_data import (
+    CHUNK_SIZE, _chunked, _compressed, export_filename, format_csv_value,
+    get_field, overlapping_fields, projection_columns, stream_export
+)
+from import_csv import infer_value_type
+
+
+def test_projection_columns():
+    assert projection_columns(None) is None
+    assert projection_columns({"price": 0}) is None
+    assert projection_columns({"name": 1, "price": True}) == ["name", "price"]
+    assert projection_columns({"name": 1, "_id": 0}) == ["name"]
+    assert projection_columns({"name": 1, "_id": 1}) == ["_id", "name"]
+
+
+def test_get_field_follows_dotted_paths():
+    doc = {"a": {"b": {"c": 3}}, "x": 1}
+    assert get_field(doc, "x") == 1
+    assert get_field(doc, "a.b.c") == 3
+    assert get_field(doc, "a.missing") is None
+    assert get_field(doc, "x.y") is None
+
+
+def test_format_csv_value():
+    assert format_csv_value(None) == ""
+    assert format_csv_value(True) == "true"
+    assert format_csv_value(12) == "12"
+    assert format_csv_value(1.5) == "1.5"
+    assert format_csv_value({"a": [1, 2]}) == '{"a": [1, 2]}'
+    assert format_csv_value(datetime(2024, 1, 2, 3, 4)) == "2024-01-02T03:04:00"
+
+
+def test_csv_export_round_trips_through_import_csv():
+    docs = [
+        {"name": "Desk, Chair", "price": 250, "rating": 4.5, "in_stock": True, "note": None},
+        {"name": 'Say "hi"', "price": -3, "rating": 0.0, "in_stock": False, "note": "line\nbreak"},
+    ]
+    columns = ["name", "price", "rating", "in_stock", "note"]
+    out = b"".join(stream_export(iter(docs), "csv", columns)).decode("utf-8")
+
+    rows = list(csv.DictReader(io.StringIO(out)))
+    assert [{k: infer_value_type(v) for k, v in row.items()} for row in rows] == docs
+
+
+def test_csv_header_written_before_rows():
+    assert b"".join(stream_export(iter([]), "csv", ["a", "b"])) == b"a,b\r\n"
+
+    pulled = []
+
+    def docs():
+        for i in range(3):
+            pulled.append(i)
+            yield {"a": i}
+
+    lines = stream_export(docs(), "csv", ["a"])
+    assert b"".join(lines).startswith(b"a\r\n0\r\n")
+    assert pulled == [0, 1, 2]
+
+
+def test_jsonl_export_selects_columns():
+    docs = [{"_id": 1, "name": "Laptop", "specs": {"ram": 16}}]
+    out = b"".join(stream_export(iter(docs), "jsonl", ["name", "specs.ram"]))
+    assert [json.loads(line) for line in out.splitlines()] == [{"name": "Laptop", "specs.ram": 16}]
+
+
+def test_jsonl_export_keeps_group_keys_as_json():
+    docs = [{"_id": {"cat": "x", "year": 2020}, "total": 5}, {"_id": 3, "total": 1}]
+    out = b"".join(stream_export(iter(docs), "jsonl"))
+    assert [json.loads(line) for line in out.splitlines()] == docs
+
+
+def test_overlapping_fields():
+    assert overlapping_fields(["a", "b", "ab.c"]) is None
+    assert overlapping_fields(["a.b", "c", "a"]) == ["a", "a.b"]
+
+
+def test_chunked_batches_lines():
+    lines = ["x" * 100 + "\n"] * 2000
+    chunks = list(_chunked(lines, chunk_size=1000))
+    assert b"".join(chunks) == "".join(lines).encode("utf-8")
+    assert all(len(c) < 1000 + 101 for c in chunks)
+
+
+def test_gzip_compression():
+    chunks = [b"a,b\r\n", b"1,2\r\n" * 1000]
+    assert gzip.decompress(b"".join(_compressed(chunks, "gzip"))) == b"".join(chunks)
+
+
+def test_zstd_compression():
+    zstandard = pytest.importorskip("zstandard")
+    chunks = [b"a,b\r\n", b"1,2\r\n" * 1000]
+    out = b"".join(_compressed(chunks, "zstd"))
+    reader = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(out))
+    assert reader.read() == b"".join(chunks)
+
+
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_export_reads_rows_lazily(compression):
+    # Memory stays flat: producing a chunk only pulls the rows needed to fill it
+    pulled = itertools.count()
+
+    def docs():
+        for i in itertools.count():
+            next(pulled)
+            yield {"name": f"item-{i}", "price": i}
+
+    stream = stream_export(docs(), "csv", ["name", "price"], compression)
+    for _ in range(3):
+        next(stream)
+    assert next(pulled) < CHUNK_SIZE
+
+
+def test_export_filename_is_header_safe():
+    assert export_filename("products", "csv", None) == "products.csv"
+    assert export_filename("products", "jsonl", "gzip") == "products.jsonl.gz"
+    assert export_filename('a"béc', "csv", "zstd") == "a_b_c.csv.zst"
+    assert export_filename('"', "csv", None) == "export.csv"